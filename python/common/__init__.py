@@ -1,2 +1,3 @@
 from common.config_provider import ConfigProvider
 from common.bitmovin_argument import BitmovinArgument
+from common.resource_cache import ResourceCache
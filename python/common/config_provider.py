@@ -62,7 +62,12 @@ class ConfigProvider(object):
             BitmovinArgument("16 byte encryption key id, represented as 32 hexadecimal characters Example: "
                              "08eecef4b026deec395234d94218273d"),
         "DRM_WIDEVINE_PSSH":
-            BitmovinArgument("Base64 encoded PSSH payload Example: QWRvYmVhc2Rmc2FkZmFzZg==")
+            BitmovinArgument("Base64 encoded PSSH payload Example: QWRvYmVhc2Rmc2FkZmFzZg=="),
+        "WEBHOOK_RECEIVER_URL":
+            BitmovinArgument("Publicly reachable URL forwarding to the local webhook receiver. "
+                             "Example: https://my-tunnel.biz/bitmovin"),
+        "WEBHOOK_RECEIVER_PORT":
+            BitmovinArgument("The local port the webhook receiver listens on. Example: 8080")
     }
 
     def __init__(self):
@@ -156,6 +161,12 @@ class ConfigProvider(object):
     def get_drm_widevine_pssh(self):
         return self._get_or_throw_exception("DRM_WIDEVINE_PSSH")
 
+    def get_webhook_receiver_url(self):
+        return self._get_or_throw_exception("WEBHOOK_RECEIVER_URL")
+
+    def get_webhook_receiver_port(self):
+        return int(self._get_or_throw_exception("WEBHOOK_RECEIVER_PORT"))
+
     def get_parameter_by_key(self, key_name):
         return self._get_or_throw_exception(key_name)
 
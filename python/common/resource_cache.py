@@ -0,0 +1,106 @@
+import hashlib
+import json
+import tempfile
+import threading
+
+from os import makedirs, path, remove, replace
+from pathlib import Path
+
+
+class ResourceCache(object):
+    """
+    Remembers the IDs of created resources (e.g. inputs, outputs or codec configurations) in a local JSON file,
+    so that subsequent executions can reuse them instead of creating identical resources again.
+
+    Resources are identified by the account they belong to, their type and the payload they are created with.
+    """
+
+    def __init__(self, api_key, tenant_org_id=None, cache_file_path=None):
+        # type: (str, str, str) -> None
+
+        if cache_file_path is None:
+            cache_file_path = path.join(str(Path.home()), ".bitmovin", "resource_cache.json")
+
+        self.cache_file_path = cache_file_path
+        self._account = self._hash([api_key, tenant_org_id])
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def get_or_create(self, resource, create, get):
+        # type: (object, callable, callable) -> object
+        """
+        Retrieves the cached resource matching the given one, or creates it if there is none
+
+        :param resource: The resource to be created. Its type and its to_dict() representation identify it.
+        :param create: Function creating the resource, returning the created resource
+        :param get: Function retrieving a resource by its ID. If it fails with HTTP status 404, the resource is
+                    created again.
+        """
+
+        key = self._build_key(resource)
+
+        with self._lock:
+            resource_id = self._entries.get(key)
+
+        if resource_id is not None:
+            try:
+                return get(resource_id)
+            except Exception as ex:
+                if getattr(ex, "http_status_code", None) != 404:
+                    raise
+                print("Cached {} '{}' does not exist anymore".format(type(resource).__name__, resource_id))
+
+        created = create()
+
+        with self._lock:
+            self._entries[key] = created.id
+            self._save()
+
+        return created
+
+    def _load(self):
+        # type: () -> dict
+
+        try:
+            with open(self.cache_file_path, 'r') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as ex:
+            # The cache is only an optimization, so an unreadable file is replaced on the next save
+            print("Ignoring unreadable resource cache file {}: {}".format(self.cache_file_path, ex))
+            return {}
+
+        if not isinstance(entries, dict):
+            print("Ignoring invalid resource cache file {}".format(self.cache_file_path))
+            return {}
+
+        return entries
+
+    def _save(self):
+        # type: () -> None
+
+        cache_file_directory = path.dirname(self.cache_file_path)
+        makedirs(cache_file_directory, exist_ok=True)
+
+        # Written to a temporary file first and moved into place, so that an interrupted or concurrent write
+        # never leaves a truncated cache file behind
+        with tempfile.NamedTemporaryFile('w', dir=cache_file_directory, suffix=".tmp", delete=False) as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+
+        try:
+            replace(f.name, self.cache_file_path)
+        except OSError:
+            remove(f.name)
+            raise
+
+    def _build_key(self, resource):
+        # type: (object) -> str
+
+        return self._hash([self._account, type(resource).__name__, resource.to_dict()])
+
+    @staticmethod
+    def _hash(value):
+        # type: (object) -> str
+
+        return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
@@ -1,14 +1,25 @@
-import time
+import asyncio
+import logging
+import random
+import threading
+from collections import namedtuple
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from os import path
 
+import requests
 from bitmovin_api_sdk import AacAudioConfiguration, AclEntry, AclPermission, AudioMixChannelType, \
     AudioMixInputChannelLayout, AudioMixInputStream, AudioMixInputStreamChannel, AudioMixSourceChannelType, \
     AudioMixInputStreamSourceChannel, BitmovinApi, BitmovinApiLogger, CodecConfiguration, \
     DolbyDigitalAudioConfiguration, DolbyDigitalChannelLayout, Encoding, EncodingOutput, H264VideoConfiguration, \
     HttpInput, IngestInputStream, Input, InputStream, MessageType, Mp4Muxing, MuxingStream, Output, \
-    PresetConfiguration, S3Output, Status, Stream, StreamInput, StreamMode, StreamSelectionMode, Task
-from common.config_provider import ConfigProvider
+    PresetConfiguration, S3Output, Status, Stream, StreamInput, StreamMode, StreamSelectionMode, Task, Webhook, \
+    WebhookHttpMethod
+from bitmovin_api_sdk.common import rest_client
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from common.config_provider import ConfigProvider, MissingArgumentError
+from common.resource_cache import ResourceCache
 
 """
 This example demonstrates one mechanism to create a stereo and surround audio track in the output
@@ -18,6 +29,8 @@ and mapping them to output channels (by type).
 <p>This example illustrates one of the use cases in the [tutorial on audio manipulations]
 (https://bitmovin.com/docs/encoding/tutorials/separating-and-combining-audio-streams)
 
+<p>This example requires Python 3.9 or newer.
+
 <p>The following configuration parameters are expected:
 
 <ul>
@@ -33,6 +46,9 @@ and mapping them to output channels (by type).
   <li>S3_OUTPUT_SECRET_KEY - The secret key of your S3 output bucket
   <li>S3_OUTPUT_BASE_PATH - The base path on your S3 output bucket where content will be written.
       Example: /outputs
+  <li>WEBHOOK_RECEIVER_URL - (optional) A publicly reachable URL forwarding to the local webhook
+      receiver. If not set, the encoding status is polled instead.
+  <li>WEBHOOK_RECEIVER_PORT - (optional) The local port the webhook receiver listens on. Default: 8080
 </ul>
 
 <p>Configuration parameters will be retrieved from these sources in the listed order:
@@ -47,106 +63,222 @@ and mapping them to output channels (by type).
 </ol>
 """
 
-EXAMPLE_NAME = "StreamMappingMonoInputTracks-{}".format(datetime.now().isoformat(timespec='seconds'))
-config_provider = ConfigProvider()
-bitmovin_api = BitmovinApi(api_key=config_provider.get_bitmovin_api_key(),
-                           # uncomment the following line if you are working with a multi-tenant account
-                           # tenant_org_id=config_provider.get_bitmovin_tenant_org_id(),
-                           logger=BitmovinApiLogger())
-
 
-class ChannelMappingConfig:
+class _ApiRetry(Retry):
     """
-    Helper class representing the mapping from source channels to output channels
+    Retry configuration which randomizes the exponential backoff time, so that concurrent requests failing at
+    the same time are not retried at the same time again.
+
+    <p>Besides the idempotent methods of the method whitelist, POST requests are retried if they were rate
+    limited (HTTP status 429), as they have not been processed by the API in this case.
     """
 
-    def __init__(self, output_channel_type, source_channel_number):
-        # type: (AudioMixChannelType, int) -> None
-        self._output_channel_type = output_channel_type
-        self._source_channel_number = source_channel_number
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == "POST":
+            return status_code == 429
 
-    @property
-    def output_channel_type(self):
-        # type: () -> AudioMixChannelType
-        return self._output_channel_type
+        return super(_ApiRetry, self).is_retry(method, status_code, has_retry_after)
 
-    @property
-    def source_channel_number(self):
-        # type: () -> int
-        return self._source_channel_number
+    def get_backoff_time(self):
+        return random.uniform(0, super(_ApiRetry, self).get_backoff_time())
 
 
-def main():
-    encoding = _create_encoding(
-        name="Audio Mapping - Stream Mapping - Multiple Mono Tracks",
-        description="Input with multiple mono tracks -> Output with stereo and surround tracks"
-    )
+def _create_shared_session():
+    # type: () -> requests.Session
+    """
+    Creates a requests session with a connection pool, so that all API calls reuse already established
+    (TLS) connections instead of opening a new one per request. Requests failing due to rate limiting or
+    temporary server errors are retried with a jittered exponential backoff, respecting Retry-After headers.
 
-    http_input = _create_http_input(host=config_provider.get_http_input_host())
-    output = _create_s3_output(
-        bucket_name=config_provider.get_s3_output_bucket_name(),
-        access_key=config_provider.get_s3_output_access_key(),
-        secret_key=config_provider.get_s3_output_secret_key()
+    <p>POST requests (creating resources or starting the encoding) are only retried on connection errors and
+    rate limiting, where the request has not reached or not been processed by the API. A POST failing with a
+    server error or a read timeout may already have been processed, so retrying it could create duplicate
+    resources or fail because the encoding has already been started. Such errors are raised instead.
+    """
+
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=_ApiRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
     )
 
-    h264_config = _create_h264_video_configuration()
-    aac_config = _create_aac_audio_configuration()
-    dd_config = _create_dd_surround_audio_configuration()
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Set up once by _initialize() when the example is first run, so that importing this module has no side effects
+# and repeated runs share the same API client
+config_provider = None  # type: ConfigProvider
+resource_cache = None  # type: ResourceCache
+bitmovin_api = None  # type: BitmovinApi
+# Set at the start of each run, so that every encoding writes to its own output folder
+output_base_path = None  # type: str
+
+POLLING_INITIAL_INTERVAL = 1.0
+POLLING_BACKOFF_FACTOR = 1.7
+POLLING_MAX_INTERVAL = 30.0
+DEFAULT_WEBHOOK_RECEIVER_PORT = 8080
+WEBHOOK_FALLBACK_INITIAL_TIMEOUT = 60
+WEBHOOK_FALLBACK_MAX_TIMEOUT = 600
+
+
+# Mapping from a source channel (the position of a mono track in the input file) to an output channel
+ChannelMappingConfig = namedtuple("ChannelMappingConfig", ["output_channel_type", "source_channel_number"])
+
+STEREO_MAP = (
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_LEFT, source_channel_number=0),
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_RIGHT, source_channel_number=1)
+)
+SURROUND_MAP = (
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_LEFT, source_channel_number=2),
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_RIGHT, source_channel_number=3),
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.BACK_LEFT, source_channel_number=4),
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.BACK_RIGHT, source_channel_number=5),
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.CENTER, source_channel_number=6),
+    ChannelMappingConfig(output_channel_type=AudioMixChannelType.LOW_FREQUENCY, source_channel_number=7)
+)
+
+# Public read permissions for all written files, so they can be accessed easily via HTTP
+PUBLIC_READ_ACL = (
+    AclEntry(permission=AclPermission.PUBLIC_READ),
+)
+
+# Each ingest input stream holds a single mono track, so every output channel uses its first channel
+MONO_SOURCE_CHANNEL = AudioMixInputStreamSourceChannel(
+    type_=AudioMixSourceChannelType.CHANNEL_NUMBER,
+    channel_number=0
+)
+
+
+def _initialize():
+    # type: () -> None
+    """
+    Sets up the configuration, the API client and the resource cache used by all other functions. Does
+    nothing if they have been set up already.
+    """
+
+    global config_provider, resource_cache, bitmovin_api
+
+    if bitmovin_api is not None:
+        return
+
+    # The SDK sends every request via the module level requests.request function, which opens a new session
+    # each time. Routing these calls through a shared session enables connection reuse for all API clients.
+    rest_client.requests = _create_shared_session()
+
+    provider = ConfigProvider()
+
+    config_provider = provider
+    resource_cache = ResourceCache(api_key=provider.get_bitmovin_api_key(),
+                                   # uncomment the following line if you are working with a multi-tenant account
+                                   # tenant_org_id=provider.get_bitmovin_tenant_org_id()
+                                   )
+    # Assigned last, as it marks the setup as completed
+    bitmovin_api = BitmovinApi(api_key=provider.get_bitmovin_api_key(),
+                               # uncomment the following line if you are working with a multi-tenant account
+                               # tenant_org_id=provider.get_bitmovin_tenant_org_id(),
+                               logger=BitmovinApiLogger())
+
+
+async def main():
+    global output_base_path
+
+    _initialize()
+
+    example_name = "StreamMappingMonoInputTracks-{}".format(datetime.now().isoformat(timespec='seconds'))
+    output_base_path = path.join(config_provider.get_s3_output_base_path(), example_name)
 
+    input_host = config_provider.get_http_input_host()
+    bucket_name = config_provider.get_s3_output_bucket_name()
+    access_key = config_provider.get_s3_output_access_key()
+    secret_key = config_provider.get_s3_output_secret_key()
     input_file_path = config_provider.get_http_input_file_path_with_multiple_mono_audio_tracks()
 
-    video_ingest_input_stream = _create_ingest_input_stream(
-        encoding=encoding,
-        input=http_input,
-        input_path=input_file_path
+    # The SDK is synchronous, so its calls are run in worker threads. Calls that do not depend on each
+    # other are awaited together.
+    encoding, http_input, output, h264_config, aac_config, dd_config = await asyncio.gather(
+        asyncio.to_thread(
+            _create_encoding,
+            name="Audio Mapping - Stream Mapping - Multiple Mono Tracks",
+            description="Input with multiple mono tracks -> Output with stereo and surround tracks"
+        ),
+        asyncio.to_thread(_create_http_input, host=input_host),
+        asyncio.to_thread(
+            _create_s3_output,
+            bucket_name=bucket_name,
+            access_key=access_key,
+            secret_key=secret_key
+        ),
+        asyncio.to_thread(_create_h264_video_configuration),
+        asyncio.to_thread(_create_aac_audio_configuration),
+        asyncio.to_thread(_create_dd_surround_audio_configuration)
     )
 
-    stereo_map = [
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_LEFT, source_channel_number=0),
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_RIGHT, source_channel_number=1)
-    ]
-    surround_map = [
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_LEFT, source_channel_number=2),
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.FRONT_RIGHT, source_channel_number=3),
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.BACK_LEFT, source_channel_number=4),
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.BACK_RIGHT, source_channel_number=5),
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.CENTER, source_channel_number=6),
-        ChannelMappingConfig(output_channel_type=AudioMixChannelType.LOW_FREQUENCY, source_channel_number=7),
-    ]
-
-    stereo_mix_input_stream = _create_audio_mix_input_stream(
-        encoding=encoding,
-        input=http_input,
-        input_file_path=input_file_path,
-        channel_layout=AudioMixInputChannelLayout.CL_STEREO,
-        mapping_configs=stereo_map
+    # All ingest input streams are created in a single batch, before any audio mix is assembled from them
+    video_ingest_input_stream, audio_ingest_input_streams = await asyncio.gather(
+        asyncio.to_thread(
+            _create_ingest_input_stream,
+            encoding=encoding,
+            input=http_input,
+            input_path=input_file_path
+        ),
+        _create_ingest_input_streams_for_audio_tracks(
+            encoding=encoding,
+            input=http_input,
+            input_path=input_file_path,
+            positions={mapping_config.source_channel_number for mapping_config in STEREO_MAP + SURROUND_MAP}
+        )
     )
 
-    surround_mix_input_stream = _create_audio_mix_input_stream(
-        encoding=encoding,
-        input=http_input,
-        input_file_path=input_file_path,
-        channel_layout=AudioMixInputChannelLayout.CL_5_1_BACK,
-        mapping_configs=surround_map
+    stereo_mix_input_stream, surround_mix_input_stream = await asyncio.gather(
+        asyncio.to_thread(
+            _create_audio_mix_input_stream,
+            encoding=encoding,
+            channel_layout=AudioMixInputChannelLayout.CL_STEREO,
+            mapping_configs=STEREO_MAP,
+            audio_ingest_input_streams=audio_ingest_input_streams
+        ),
+        asyncio.to_thread(
+            _create_audio_mix_input_stream,
+            encoding=encoding,
+            channel_layout=AudioMixInputChannelLayout.CL_5_1_BACK,
+            mapping_configs=SURROUND_MAP,
+            audio_ingest_input_streams=audio_ingest_input_streams
+        )
     )
 
-    video_stream = _create_stream(
-        encoding=encoding,
-        input_stream=video_ingest_input_stream,
-        codec_configuration=h264_config
-    )
-    audio_stream1 = _create_stream(
-        encoding=encoding,
-        input_stream=stereo_mix_input_stream,
-        codec_configuration=aac_config
-    )
-    audio_stream2 = _create_stream(
-        encoding=encoding,
-        input_stream=surround_mix_input_stream,
-        codec_configuration=dd_config
+    video_stream, audio_stream1, audio_stream2 = await asyncio.gather(
+        asyncio.to_thread(
+            _create_stream,
+            encoding=encoding,
+            input_stream=video_ingest_input_stream,
+            codec_configuration=h264_config
+        ),
+        asyncio.to_thread(
+            _create_stream,
+            encoding=encoding,
+            input_stream=stereo_mix_input_stream,
+            codec_configuration=aac_config
+        ),
+        asyncio.to_thread(
+            _create_stream,
+            encoding=encoding,
+            input_stream=surround_mix_input_stream,
+            codec_configuration=dd_config
+        )
     )
 
-    _create_mp4_muxing(
+    await asyncio.to_thread(
+        _create_mp4_muxing,
         encoding=encoding,
         output=output,
         output_path="/",
@@ -154,52 +286,218 @@ def main():
         file_name="stereo-and-surround-tracks-mapped.mp4"
     )
 
-    _execute_encoding(encoding=encoding)
+    await _execute_encoding(encoding=encoding)
 
 
-def _execute_encoding(encoding):
+async def _execute_encoding(encoding):
     # type: (Encoding) -> None
     """
-    Starts the actual encoding process and periodically polls its status until it reaches a final state
+    Starts the actual encoding process and waits until it reaches a final state
+
+    <p>If WEBHOOK_RECEIVER_URL is configured, a local webhook receiver is started and registered for the
+    finished and error notifications of the encoding. Otherwise the status is polled periodically.
 
     <p>API endpoints:
     https://bitmovin.com/docs/encoding/api-reference/all#/Encoding/PostEncodingEncodingsStartByEncodingId
     https://bitmovin.com/docs/encoding/api-reference/sections/encodings#/Encoding/GetEncodingEncodingsStatusByEncodingId
-
-    <p>Please note that you can also use our webhooks API instead of polling the status. For more
-    information consult the API spec:
     https://bitmovin.com/docs/encoding/api-reference/sections/notifications-webhooks
 
     :param encoding: The encoding to be started
     """
-    bitmovin_api.encoding.encodings.start(encoding_id=encoding.id)
+    webhook_receiver = _start_webhook_receiver()
+
+    try:
+        if webhook_receiver is not None:
+            await asyncio.to_thread(_create_encoding_webhooks, encoding_id=encoding.id, url=webhook_receiver.url)
 
-    task = _wait_for_enoding_to_finish(encoding_id=encoding.id)
+        await asyncio.to_thread(bitmovin_api.encoding.encodings.start, encoding_id=encoding.id)
 
-    while task.status is not Status.FINISHED and task.status is not Status.ERROR:
-        task = _wait_for_enoding_to_finish(encoding_id=encoding.id)
+        if webhook_receiver is not None:
+            task = await _wait_for_encoding_notification(encoding_id=encoding.id, notified=webhook_receiver.notified)
+        else:
+            task = await _poll_encoding_status(encoding_id=encoding.id)
+    finally:
+        if webhook_receiver is not None:
+            webhook_receiver.shutdown()
+            webhook_receiver.server_close()
 
-    if task.status is Status.ERROR:
+    if task.status == Status.ERROR:
         _log_task_errors(task=task)
         raise Exception("Encoding failed")
 
     print("Encoding finished successfully")
 
 
-def _wait_for_enoding_to_finish(encoding_id):
+async def _wait_for_encoding_notification(encoding_id, notified):
+    # type: (str, asyncio.Event) -> Task
+    """
+    Blocks until the webhook receiver got notified and retrieves the final status of the given encoding id.
+
+    <p>If no notification arrives within the timeout (e.g. because the receiver is not reachable), the
+    status is checked anyway and the timeout is doubled for the next attempt.
+
+    :param encoding_id: The encoding which should be checked
+    :param notified: The event set by the webhook receiver
+    """
+
+    timeout = WEBHOOK_FALLBACK_INITIAL_TIMEOUT
+
+    while True:
+        try:
+            await asyncio.wait_for(notified.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print("No webhook notification received within {} seconds, checking status".format(timeout))
+            timeout = min(timeout * 2, WEBHOOK_FALLBACK_MAX_TIMEOUT)
+
+        # Cleared before checking the status, so that a notification arriving meanwhile is not lost
+        notified.clear()
+
+        task = await asyncio.to_thread(bitmovin_api.encoding.encodings.status, encoding_id=encoding_id)
+        print("Encoding status is {} (progress: {} %)".format(task.status, task.progress))
+
+        if task.status in (Status.FINISHED, Status.ERROR):
+            return task
+
+
+async def _poll_encoding_status(encoding_id):
     # type: (str) -> Task
     """
-    Waits five second and retrieves afterwards the status of the given encoding id
+    Polls the status of the given encoding id until it reaches a final state. Only used if no webhook
+    receiver is configured.
+
+    <p>The polling interval starts at POLLING_INITIAL_INTERVAL seconds and grows exponentially up to
+    POLLING_MAX_INTERVAL seconds while the progress does not change. While the progress advances, the
+    current interval is kept.
 
     :param encoding_id: The encoding which should be checked
     """
 
-    time.sleep(5)
-    task = bitmovin_api.encoding.encodings.status(encoding_id=encoding_id)
+    interval = POLLING_INITIAL_INTERVAL
+    progress = None
+
+    while True:
+        task = await _wait_for_enoding_to_finish(encoding_id=encoding_id, interval=interval)
+
+        if task.status in (Status.FINISHED, Status.ERROR):
+            return task
+
+        if task.progress == progress:
+            interval = min(interval * POLLING_BACKOFF_FACTOR, POLLING_MAX_INTERVAL)
+
+        progress = task.progress
+
+
+async def _wait_for_enoding_to_finish(encoding_id, interval):
+    # type: (str, float) -> Task
+    """
+    Waits the given interval and retrieves afterwards the status of the given encoding id
+
+    :param encoding_id: The encoding which should be checked
+    :param interval: The number of seconds to wait before retrieving the status
+    """
+
+    await asyncio.sleep(interval)
+    task = await asyncio.to_thread(bitmovin_api.encoding.encodings.status, encoding_id=encoding_id)
     print("Encoding status is {} (progress: {} %)".format(task.status, task.progress))
     return task
 
 
+def _start_webhook_receiver():
+    # type: () -> Optional[_WebhookReceiver]
+    """
+    Starts an HTTP server in a background thread which receives the webhook notifications of the encoding.
+    Returns None if WEBHOOK_RECEIVER_URL is not configured. Has to be called from within the running event loop.
+
+    <p>The server is bound to WEBHOOK_RECEIVER_PORT on all interfaces. WEBHOOK_RECEIVER_URL has to forward to
+    this port, e.g. via a reverse proxy or tunnel, as the Bitmovin API needs to be able to reach it.
+    """
+
+    try:
+        url = config_provider.get_webhook_receiver_url()
+    except MissingArgumentError:
+        return None
+
+    try:
+        port = config_provider.get_webhook_receiver_port()
+    except MissingArgumentError:
+        port = DEFAULT_WEBHOOK_RECEIVER_PORT
+
+    server = _WebhookReceiver(port=port, url=url, loop=asyncio.get_running_loop())
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print("Webhook receiver listening on port {}".format(port))
+
+    return server
+
+
+class _WebhookReceiver(HTTPServer):
+    """
+    HTTP server receiving the webhook notifications of an encoding
+    """
+
+    def __init__(self, port, url, loop):
+        # type: (int, str, asyncio.AbstractEventLoop) -> None
+        """
+        :param port: The local port the server listens on
+        :param url: The publicly reachable URL forwarding to this server, used when registering the webhooks
+        :param loop: The event loop waiting for the notifications
+        """
+        super(_WebhookReceiver, self).__init__(("", port), _WebhookRequestHandler)
+        self.url = url
+        self.loop = loop
+        self.notified = asyncio.Event()
+
+    def notify(self):
+        # type: () -> None
+        """
+        Sets the notified event. As the server runs in its own thread, the event is set on the event loop.
+        """
+        self.loop.call_soon_threadsafe(self.notified.set)
+
+
+class _WebhookRequestHandler(BaseHTTPRequestHandler):
+    """
+    Notifies its server as soon as a webhook notification is received
+    """
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(204)
+        self.end_headers()
+        self.server.notify()
+
+    def log_message(self, format, *args):
+        print("Webhook receiver: {}".format(format % args))
+
+
+def _create_encoding_webhooks(encoding_id, url):
+    # type: (str, str) -> None
+    """
+    Registers webhooks which notify the given URL when the encoding has finished or failed
+
+    <p>API endpoints:
+    https://bitmovin.com/docs/encoding/api-reference/sections/notifications-webhooks#/Notifications/PostNotificationsWebhooksEncodingEncodingsFinishedByEncodingId
+    https://bitmovin.com/docs/encoding/api-reference/sections/notifications-webhooks#/Notifications/PostNotificationsWebhooksEncodingEncodingsErrorByEncodingId
+
+    :param encoding_id: The encoding for which the webhooks are created
+    :param url: The URL the notifications will be sent to
+    """
+
+    webhook = Webhook(
+        url=url,
+        method=WebhookHttpMethod.POST
+    )
+
+    bitmovin_api.notifications.webhooks.encoding.encodings.finished.create_by_encoding_id(
+        encoding_id=encoding_id,
+        webhook=webhook
+    )
+    bitmovin_api.notifications.webhooks.encoding.encodings.error.create_by_encoding_id(
+        encoding_id=encoding_id,
+        webhook=webhook
+    )
+
+
 def _create_encoding(name, description):
     # type: (str, str) -> Encoding
     """
@@ -226,19 +524,22 @@ def _create_http_input(host):
     <a href="https://bitmovin.com/docs/encoding/articles/supported-input-output-storages">
     list of supported input and output storages</a>
 
-    For reasons of simplicity, a new input resource is created on each execution of this
-    example. In production use, this method should be replaced by a
-    <a href="https://bitmovin.com/docs/encoding/api-reference/sections/inputs#/Encoding/GetEncodingInputsHttpByInputId">
-    get call</a> to retrieve an existing resource.
+    The ID of the created input resource is stored in the local resource cache. Subsequent executions of this
+    example with the same host retrieve the existing resource instead of creating a new one.
 
-    API endpoint:
+    API endpoints:
         https://bitmovin.com/docs/encoding/api-reference/sections/inputs#/Encoding/PostEncodingInputsHttp
+        https://bitmovin.com/docs/encoding/api-reference/sections/inputs#/Encoding/GetEncodingInputsHttpByInputId
 
     :param host: The hostname or IP address of the HTTP server e.g.: my-storage.biz
     """
     http_input = HttpInput(host=host)
 
-    return bitmovin_api.encoding.inputs.http.create(http_input=http_input)
+    return resource_cache.get_or_create(
+        resource=http_input,
+        create=lambda: bitmovin_api.encoding.inputs.http.create(http_input=http_input),
+        get=lambda input_id: bitmovin_api.encoding.inputs.http.get(input_id=input_id)
+    )
 
 
 def _create_s3_output(bucket_name, access_key, secret_key):
@@ -254,13 +555,12 @@ def _create_s3_output(bucket_name, access_key, secret_key):
     href="https://bitmovin.com/docs/encoding/faqs/how-do-i-create-a-aws-s3-bucket-which-can-be-used-as-output-location">
     creating an S3 bucket and setting permissions</a> for further information
 
-    <p>For reasons of simplicity, a new output resource is created on each execution of this
-    example. In production use, this method should be replaced by a
-    <a href="https://bitmovin.com/docs/encoding/api-reference/sections/outputs#/Encoding/GetEncodingOutputsS3">
-    get call</a> retrieving an existing resource.
+    <p>The ID of the created output resource is stored in the local resource cache. Subsequent executions of
+    this example with the same bucket and credentials retrieve the existing resource instead of creating a new one.
 
-    <p>API endpoint:
+    <p>API endpoints:
     https://bitmovin.com/docs/encoding/api-reference/sections/outputs#/Encoding/PostEncodingOutputsS3
+    https://bitmovin.com/docs/encoding/api-reference/sections/outputs#/Encoding/GetEncodingOutputsS3ByOutputId
 
     :param bucket_name: The name of the S3 bucket
     :param access_key: The access key of your S3 account
@@ -273,7 +573,11 @@ def _create_s3_output(bucket_name, access_key, secret_key):
         secret_key=secret_key
     )
 
-    return bitmovin_api.encoding.outputs.s3.create(s3_output=s3_output)
+    return resource_cache.get_or_create(
+        resource=s3_output,
+        create=lambda: bitmovin_api.encoding.outputs.s3.create(s3_output=s3_output),
+        get=lambda output_id: bitmovin_api.encoding.outputs.s3.get(output_id=output_id)
+    )
 
 
 def _create_ingest_input_stream(encoding, input, input_path):
@@ -303,8 +607,8 @@ def _create_ingest_input_stream(encoding, input, input_path):
     )
 
 
-def _create_ingest_input_stream_for_audio_track(encoding, input, input_path, position):
-    # type: (Encoding, Input, str, int) -> IngestInputStream
+def _create_ingest_input_stream_for_audio_track(encoding_id, input_id, input_path, position):
+    # type: (str, str, str, int) -> IngestInputStream
     """
     Creates an IngestInputStream to select a specific audio strack in the input, and adds it to an
     encoding
@@ -314,50 +618,78 @@ def _create_ingest_input_stream_for_audio_track(encoding, input, input_path, pos
     <p>API endpoint:
     https://bitmovin.com/docs/encoding/api-reference/sections/encodings#/Encoding/PostEncodingEncodingsInputStreamsIngestByEncodingId
 
-    :param encoding: The encoding to which the stream will be added
-    :param input: The input resource providing the input file
+    :param encoding_id: The ID of the encoding to which the stream will be added
+    :param input_id: The ID of the input resource providing the input file
     :param input_path: The path to the input file
     :param position: The relative position of the audio track to select in the input file
     """
 
     ingest_input_stream = IngestInputStream(
-        input_id=input.id,
+        input_id=input_id,
         input_path=input_path,
         selection_mode=StreamSelectionMode.AUDIO_RELATIVE,
         position=position
     )
 
     return bitmovin_api.encoding.encodings.input_streams.ingest.create(
-        encoding_id=encoding.id,
+        encoding_id=encoding_id,
         ingest_input_stream=ingest_input_stream
     )
 
 
-def _create_audio_mix_input_stream(encoding, input, input_file_path, channel_layout, mapping_configs):
-    # type: (Encoding, Input, str, AudioMixInputChannelLayout, list) -> AudioMixInputStream
+async def _create_ingest_input_streams_for_audio_tracks(encoding, input, input_path, positions):
+    # type: (Encoding, Input, str, set[int]) -> dict[int, IngestInputStream]
+    """
+    Creates an IngestInputStream for each of the given audio track positions in the input. The
+    IngestInputStreams are created concurrently, and audio mixes mapping the same position share one of them.
+
+    :param encoding: The encoding to which the streams will be added
+    :param input: The input resource providing the input file
+    :param input_path: The path to the input file
+    :param positions: The relative positions of the audio tracks to select in the input file
+    """
+
+    positions = sorted(positions)
+
+    audio_ingest_input_streams = await asyncio.gather(*[
+        asyncio.to_thread(
+            _create_ingest_input_stream_for_audio_track,
+            encoding_id=encoding.id,
+            input_id=input.id,
+            input_path=input_path,
+            position=position
+        )
+        for position in positions
+    ])
+
+    return dict(zip(positions, audio_ingest_input_streams))
+
+
+def _create_audio_mix_input_stream(encoding, channel_layout, mapping_configs, audio_ingest_input_streams):
+    # type: (Encoding, AudioMixInputChannelLayout, tuple[ChannelMappingConfig], dict) -> AudioMixInputStream
+    """
+    Creates an AudioMixInputStream which maps the given audio tracks of the input to the output channels
+
+    <p>API endpoint:
+    https://bitmovin.com/docs/encoding/api-reference/sections/encodings#/Encoding/PostEncodingEncodingsInputStreamsAudioMixByEncodingId
+
+    :param encoding: The encoding to which the stream will be added
+    :param channel_layout: The channel layout of the audio mix
+    :param mapping_configs: The mapping from the source audio tracks to the output channels
+    :param audio_ingest_input_streams: The IngestInputStreams of the audio tracks by their position
+    """
+
     audio_mix_input_stream = AudioMixInputStream(
         channel_layout=channel_layout
     )
 
     for mapping_config in mapping_configs:
-        audio_ingest_input_stream = _create_ingest_input_stream_for_audio_track(
-            encoding=encoding,
-            input=input,
-            input_path=input_file_path,
-            position=mapping_config.source_channel_number
-        )
-
         output_channel = AudioMixInputStreamChannel(
-            input_stream_id=audio_ingest_input_stream.id,
-            output_channel_type=mapping_config.output_channel_type
-        )
-
-        source_channel = AudioMixInputStreamSourceChannel(
-            type_=AudioMixSourceChannelType.CHANNEL_NUMBER,
-            channel_number=0
+            input_stream_id=audio_ingest_input_streams[mapping_config.source_channel_number].id,
+            output_channel_type=mapping_config.output_channel_type,
+            source_channels=[MONO_SOURCE_CHANNEL]
         )
 
-        output_channel.source_channels.append(source_channel)
         audio_mix_input_stream.audio_mix_channels.append(output_channel)
 
     return bitmovin_api.encoding.encodings.input_streams.audio_mix.create(
@@ -379,8 +711,11 @@ def _create_h264_video_configuration():
     href="https://bitmovin.com/docs/encoding/tutorials/how-to-optimize-your-h264-codec-configuration-for-different-use-cases">How
     to optimize your H264 codec configuration for different use-cases</a> for alternative presets.
 
-    <p>API endpoint:
+    <p>The configuration is reused from the local resource cache if it has been created before.
+
+    <p>API endpoints:
     https://bitmovin.com/docs/encoding/api-reference/sections/configurations#/Encoding/PostEncodingConfigurationsVideoH264
+    https://bitmovin.com/docs/encoding/api-reference/sections/configurations#/Encoding/GetEncodingConfigurationsVideoH264ByConfigurationId
     """
 
     config = H264VideoConfiguration(
@@ -390,7 +725,12 @@ def _create_h264_video_configuration():
         preset_configuration=PresetConfiguration.VOD_STANDARD
     )
 
-    return bitmovin_api.encoding.configurations.video.h264.create(h264_video_configuration=config)
+    return resource_cache.get_or_create(
+        resource=config,
+        create=lambda: bitmovin_api.encoding.configurations.video.h264.create(h264_video_configuration=config),
+        get=lambda configuration_id: bitmovin_api.encoding.configurations.video.h264.get(
+            configuration_id=configuration_id)
+    )
 
 
 def _create_stream(encoding, input_stream, codec_configuration):
@@ -424,8 +764,11 @@ def _create_aac_audio_configuration():
     """
     Creates a configuration for the AAC audio codec to be applied to audio streams.
 
-    <p>API endpoint:
+    <p>The configuration is reused from the local resource cache if it has been created before.
+
+    <p>API endpoints:
     https://bitmovin.com/docs/encoding/api-reference/sections/configurations#/Encoding/PostEncodingConfigurationsAudioAac
+    https://bitmovin.com/docs/encoding/api-reference/sections/configurations#/Encoding/GetEncodingConfigurationsAudioAacByConfigurationId
     """
 
     config = AacAudioConfiguration(
@@ -433,7 +776,12 @@ def _create_aac_audio_configuration():
         bitrate=128000
     )
 
-    return bitmovin_api.encoding.configurations.audio.aac.create(aac_audio_configuration=config)
+    return resource_cache.get_or_create(
+        resource=config,
+        create=lambda: bitmovin_api.encoding.configurations.audio.aac.create(aac_audio_configuration=config),
+        get=lambda configuration_id: bitmovin_api.encoding.configurations.audio.aac.get(
+            configuration_id=configuration_id)
+    )
 
 
 def _create_dd_surround_audio_configuration():
@@ -441,8 +789,11 @@ def _create_dd_surround_audio_configuration():
     """
     Creates a Dolby Digital audio configuration.
 
-    <p>API endpoint:
+    <p>The configuration is reused from the local resource cache if it has been created before.
+
+    <p>API endpoints:
     https://bitmovin.com/docs/encoding/api-reference/sections/configurations#/Encoding/PostEncodingConfigurationsAudioDD
+    https://bitmovin.com/docs/encoding/api-reference/sections/configurations#/Encoding/GetEncodingConfigurationsAudioDDByConfigurationId
     """
     config = DolbyDigitalAudioConfiguration(
         name="Dolby Digital Channel Layout 5.1",
@@ -450,7 +801,13 @@ def _create_dd_surround_audio_configuration():
         channel_layout=DolbyDigitalChannelLayout.CL_5_1
     )
 
-    return bitmovin_api.encoding.configurations.audio.dolby_digital.create(dolby_digital_audio_configuration=config)
+    return resource_cache.get_or_create(
+        resource=config,
+        create=lambda: bitmovin_api.encoding.configurations.audio.dolby_digital.create(
+            dolby_digital_audio_configuration=config),
+        get=lambda configuration_id: bitmovin_api.encoding.configurations.audio.dolby_digital.get(
+            configuration_id=configuration_id)
+    )
 
 
 def _create_mp4_muxing(encoding, output, output_path, streams, file_name):
@@ -492,14 +849,10 @@ def _build_encoding_output(output, output_path):
     :param output_path: The path where the content will be written to
     """
 
-    acl_entry = AclEntry(
-        permission=AclPermission.PUBLIC_READ
-    )
-
     return EncodingOutput(
         output_path=_build_absolute_path(relative_path=output_path),
         output_id=output.id,
-        acl=[acl_entry]
+        acl=list(PUBLIC_READ_ACL)
     )
 
 
@@ -514,13 +867,13 @@ def _build_absolute_path(relative_path):
     :param relative_path: The relative path that is concatenated
     """
 
-    return path.join(config_provider.get_s3_output_base_path(), EXAMPLE_NAME, relative_path)
+    return path.join(output_base_path, relative_path)
 
 
 def _log_task_errors(task):
     # type: (Task) -> None
     """
-    Logs all task errors
+    Logs all task errors as a single log record
 
     :param task: The task with the error messages
     """
@@ -528,10 +881,11 @@ def _log_task_errors(task):
     if task is None:
         return
 
-    filtered = [x for x in task.messages if x.type is MessageType.ERROR]
+    errors = [x.text for x in task.messages if x.type == MessageType.ERROR]
 
-    for message in filtered:
-        print(message.text)
+    if errors:
+        logging.error("\n".join(errors))
 
 
-main()
+if __name__ == "__main__":
+    asyncio.run(main())